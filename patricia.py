@@ -3,6 +3,8 @@ A PATRICIA trie implementation for efficient matching of string collections on
 text.
 
 This class has an (Py2.7+) API nearly equal to dictionaries.
+The `suffixtrie` subclass matches keys as suffixes, scanning strings
+right-to-left.
 
 *Deleting* entries is a "half-supported" operation only. The key appears
 "removed", but the trie is not actually changed, only the node state is
@@ -26,9 +28,10 @@ is not necessary to create slices of strings to scan in a window only::
 
 License: Apache License v2 (http://www.apache.org/licenses/LICENSE-2.0.html)
 """
+import sys
 
 __author__ = 'Florian Leitner <florian.leitner@gmail.com>'
-__version__ = '10'
+__version__ = '12'
 
 
 class _NonTerminal():
@@ -74,6 +77,23 @@ def _values(node):
             yield value
 
 
+def _suffixKeys(node, accu):
+    "Yield keys of terminal nodes in this (suffix trie) branch."
+    for key, value in _suffixItems(node, accu):
+        yield key
+
+
+def _suffixItems(node, accu):
+    "Yield key, value pairs of terminal nodes in this (suffix trie) branch."
+    if node._value is not __NON_TERMINAL__:
+        yield ''.join(reversed(accu)), node._value
+    for edge, child in node._edges.values():
+        accu.append(edge)
+        for key, value in _suffixItems(child, accu):
+            yield key, value
+        accu.pop()
+
+
 class trie():
     """
     Usage Example::
@@ -137,13 +157,21 @@ class trie():
             self[key] = val
 
     @staticmethod
-    def __offsets(strlen, start, end):
+    def _offsets(strlen, start, end):
         # Return the correct start, end offsets for a string of length `strlen`.
         return (max(0, strlen + start) if start < 0 else start,
                 strlen if end is None else end)
 
     @staticmethod
-    def __check(value, match, default):
+    def _window(strlen, start, end):
+        # Return the correct start, end offsets, with `end` in [0, strlen].
+        start, end = trie._offsets(strlen, start, end)
+        if end < 0:
+            end = max(0, strlen + end)
+        return start, min(end, strlen)
+
+    @staticmethod
+    def _check(value, match, default):
         if value is not __NON_TERMINAL__:
             return match, value
         elif default is not __NON_TERMINAL__:
@@ -169,7 +197,7 @@ class trie():
 
     def _scan(self, rvalFun, string, start=0, *end):
         node = self
-        start, _ = trie.__offsets(len(string), start, None)
+        start, _ = trie._offsets(len(string), start, None)
         while node is not None:
             if node._value is not __NON_TERMINAL__:
                 yield rvalFun(string, start, node._value)
@@ -235,15 +263,15 @@ class trie():
         return False if node is None else (node._value is not __NON_TERMINAL__)
 
     def __iter__(self):
-        return _keys(self, [])
+        return self.keys()
 
     def __len__(self):
         return _count(self)
 
     def __repr__(self):
-        string = ['trie({']
+        string = [self.__class__.__name__, '({']
         first = True
-        for key, value in _items(self, []):
+        for key, value in self.items():
             if first:
                 first = False
             else:
@@ -254,6 +282,30 @@ class trie():
         string.append('})')
         return ''.join(string)
 
+    def __getstate__(self):
+        # Flatten the trie to key, value pairs without recursion, so (deep)
+        # tries can be pickled and the sentinel never needs to be.
+        state = []
+        stack = [(self, '')]
+        while stack:
+            node, key = stack.pop()
+            if node._value is not __NON_TERMINAL__:
+                state.append((key, node._value))
+            for edge, child in node._edges.values():
+                stack.append((child, self._join(key, edge)))
+        return state
+
+    def __setstate__(self, state):
+        self._edges = {}
+        self._value = __NON_TERMINAL__
+        for key, value in state:
+            self[key] = value
+
+    @staticmethod
+    def _join(key, edge):
+        # Return the key extended by the edge (of a child node).
+        return key + edge
+
     def key(self, string, start=0, end=None, default=__NON_TERMINAL__):
         """
         Return the longest key that is a prefix of ``string`` (beginning at
@@ -309,16 +361,18 @@ class trie():
         """
         node = self
         strlen = len(string)
-        start, end = trie.__offsets(strlen, start, end)
-        idx = start
+        start, end = trie._offsets(strlen, start, end)
+        idx = match = start
         last = self._value
         while idx < strlen:
             node, idx = node._find(string, idx, end)
             if node is None:
                 break
             elif node._value is not __NON_TERMINAL__:
-                last = node._value
-        return trie.__check(last, string[start:idx], default)
+                last, match = node._value, idx
+        if last is __NON_TERMINAL__:
+            match = idx  # report the matched path so far
+        return trie._check(last, string[start:match], default)
 
     def items(self, *scan):
         """
@@ -334,6 +388,31 @@ class trie():
             getItem = lambda string, idx, value: (string[scan[1]:idx], value)
             return self._scan(getItem, *scan)
 
+    def ascan(self, string, *window, **slicing):
+        """
+        Return an asynchronous iterator over all (non-empty) key, value pairs
+        that match ``string`` at any offset, cooperatively yielding to the
+        event loop.
+        See `patricia_async.ascan` for the arguments (Py3.7+ only).
+        """
+        if sys.version_info < (3, 7):
+            raise ImportError('ascan() requires Python 3.7+ (patricia_async)')
+        from patricia_async import ascan
+        return ascan(self, string, *window, **slicing)
+
+    def alongest(self, string, *window, **slicing):
+        """
+        Return a coroutine for the list of non-overlapping, longest (non-empty)
+        key, value pairs that match ``string``, cooperatively yielding to the
+        event loop.
+        See `patricia_async.alongest` for the arguments (Py3.7+ only).
+        """
+        if sys.version_info < (3, 7):
+            raise ImportError('alongest() requires Python 3.7+ '
+                              '(patricia_async)')
+        from patricia_async import alongest
+        return alongest(self, string, *window, **slicing)
+
     def isPrefix(self, prefix):
         "Return True if any key starts with ``prefix``."
         node = self
@@ -376,3 +455,245 @@ class trie():
             else:
                 return iter([])
         return _keys(node, accu)
+
+
+class suffixtrie(trie):
+    """
+    A trie that matches keys right-to-left, i.e., as *suffixes* of a string.
+
+    Scanning walks the string backwards from ``end`` (not beyond ``start``),
+    so it is not necessary to build a trie over reversed keys and reverse
+    every query string. Keys and offsets are reported in forward order.
+
+    Usage Example::
+
+      >>> T = suffixtrie(com='commercial', org='organization')
+      >>> T['example.com'] = 'example'
+      >>> T['mail.example.com'] # exact keys only, as in a dict
+      Traceback (most recent call last):
+          ...
+      KeyError: 'mail.example.com'
+      >>> S = 'mail.example.com and www.example.org'
+      >>> T.key(S) # report the (longest) key that is a suffix of S
+      'org'
+      >>> T.item(S, end=16) # using offsets: scan backwards from `end`
+      ('example.com', 'example')
+      >>> T.key(S, 10, 16) # never scan beyond `start`
+      'com'
+      >>> list(T.keys(S, 0, 16)) # iterate all matching suffixes
+      ['com', 'example.com']
+      >>> T.isSuffix('e.com') # reverse lookup: check if any key ends with S
+      True
+      >>> sorted(T.iter('com')) # and get all keys that have S as suffix
+      ['com', 'example.com']
+    """
+
+    @staticmethod
+    def _join(key, edge):
+        # Return the key extended by the edge (of a child node).
+        return edge + key
+
+    def _find(self, path, start, end):
+        if start < end and path[end - 1] in self._edges:
+            edge, child = self._edges[path[end - 1]]
+            if path.endswith(edge, start, end):
+                return child, end - len(edge)
+        return None, end  # return None
+
+    def _next(self, path, end):
+        try:
+            edge, child = self._edges[path[end - 1]]
+            if path.endswith(edge, 0, end):
+                return child, end - len(edge)
+        except KeyError:
+            pass
+        raise KeyError(path)  # raise error
+
+    def _scan(self, rvalFun, string, start=0, end=None):
+        node = self
+        start, end = trie._window(len(string), start, end)
+        idx = end
+        while node is not None:
+            if node._value is not __NON_TERMINAL__:
+                yield rvalFun(string, idx, end, node._value)
+            node, idx = node._find(string, start, idx)
+
+    def __setitem__(self, key, value):
+        node = self
+        idx = len(key)
+        while idx:
+            if key[idx - 1] in node._edges:
+                node, idx = node.__followEdge(key, idx)
+            else:
+                # no common suffix, create a new edge and (leaf) node
+                node._edges[key[idx - 1]] = (key[:idx], suffixtrie(value))
+                break
+        else:
+            node._value = value
+
+    def __followEdge(self, key, idx):
+        edge, child = self._edges[key[idx - 1]]
+        if key.endswith(edge, 0, idx):
+            # the whole suffix matches; advance
+            return child, idx - len(edge)
+        else:
+            # split edge before the matching part of the key
+            pos = 1
+            last = min(len(edge), idx)
+            while pos < last and edge[-1 - pos] == key[idx - 1 - pos]:
+                pos += 1
+            split = suffixtrie()
+            split._edges[edge[-1 - pos]] = (edge[:-pos], child)
+            self._edges[key[idx - 1]] = (edge[-pos:], split)
+            return split, idx - pos
+
+    def __getitem__(self, key):
+        node = self
+        idx = len(key)
+        while idx:
+            node, idx = node._next(key, idx)
+        if node._value is __NON_TERMINAL__:
+            raise KeyError(key)
+        else:
+            return node._value
+
+    def __delitem__(self, key):
+        node = self
+        idx = len(key)
+        while idx:
+            node, idx = node._next(key, idx)
+        if node._value is __NON_TERMINAL__:
+            raise KeyError(key)
+        node._value = __NON_TERMINAL__
+
+    def __contains__(self, key):
+        node = self
+        idx = len(key)
+        while idx and node is not None:
+            node, idx = node._find(key, 0, idx)
+        return False if node is None else (node._value is not __NON_TERMINAL__)
+
+    def key(self, string, start=0, end=None, default=__NON_TERMINAL__):
+        """
+        Return the longest key that is a suffix of ``string`` (ending at
+        ``end`` and beginning at or after ``start``).
+        If no key matches, raise a `KeyError` or return the ``default`` value
+        if it was set.
+        """
+        return self.item(string, start, end, default)[0]
+
+    def keys(self, *scan):
+        """
+        Return all keys (that are a suffix of ``string``
+        (beginning at or after ``start`` (and ending at ``end``))).
+        """
+        if not scan:
+            return _suffixKeys(self, [])
+        else:
+            getKey = lambda string, idx, end, value: string[idx:end]
+            return self._scan(getKey, *scan)
+
+    def value(self, string, start=0, end=None, default=__NON_TERMINAL__):
+        """
+        Return the value of the longest key that is a suffix of ``string``
+        (ending at ``end`` and beginning at or after ``start``).
+        If no key matches, raise a `KeyError` or return the ``default`` value
+        if it was set.
+        """
+        last, match, end = self.__walk(string, start, end)
+        if last is not __NON_TERMINAL__:
+            return last  # without slicing the key from the string
+        return trie._check(last, string[match:end], default)[1]
+
+    def values(self, *scan):
+        """
+        Return all values (for keys that are a suffix of ``string``
+        (beginning at or after ``start`` (and ending at ``end``))).
+        """
+        if not scan:
+            return _values(self)
+        else:
+            getValue = lambda string, idx, end, value: value
+            return self._scan(getValue, *scan)
+
+    def item(self, string, start=0, end=None, default=__NON_TERMINAL__):
+        """
+        Return the key, value pair of the longest key that is a suffix of
+        ``string`` (ending at ``end`` and beginning at or after ``start``).
+        If no key matches, raise a `KeyError` or return the `None`,
+        ``default`` pair if any ``default`` value was set.
+        """
+        last, match, end = self.__walk(string, start, end)
+        return trie._check(last, string[match:end], default)
+
+    def __walk(self, string, start, end):
+        # Return the value of the longest matching key, its offset, and `end`
+        # (or the sentinel and the offset of the matched path so far).
+        node = self
+        start, end = trie._window(len(string), start, end)
+        idx = match = end
+        last = self._value
+        while idx > start:
+            node, idx = node._find(string, start, idx)
+            if node is None:
+                break
+            elif node._value is not __NON_TERMINAL__:
+                last, match = node._value, idx
+        if last is __NON_TERMINAL__:
+            match = idx
+        return last, match, end
+
+    def items(self, *scan):
+        """
+        Return all key, value pairs (for keys that are a suffix of ``string``
+        (beginning at or after ``start`` (and ending at ``end``))).
+        """
+        if not scan:
+            return _suffixItems(self, [])
+        else:
+            getItem = lambda string, idx, end, value: (string[idx:end], value)
+            return self._scan(getItem, *scan)
+
+    def isPrefix(self, prefix):
+        "Return True if any key starts with ``prefix`` (a full key scan)."
+        return any(key.startswith(prefix) for key in self)
+
+    def isSuffix(self, suffix):
+        "Return True if any key ends with ``suffix``."
+        node = self
+        idx = len(suffix)
+        while idx > 0:
+            for edge, child in node._edges.values():
+                e = edge[-idx:] if (idx < len(edge)) else edge
+                if suffix.endswith(e, 0, idx):
+                    node = child
+                    idx -= len(edge)
+                    break
+            else:
+                return False
+        return True
+
+    def iter(self, suffix):
+        "Return an iterator over all keys that end with ``suffix``."
+        node = self
+        idx = len(suffix)
+        while idx:
+            try:
+                node, idx = node._next(suffix, idx)
+            except KeyError:
+                break
+        return node._accumulate(suffix, idx)
+
+    def _accumulate(self, suffix, idx):
+        node = self
+        accu = [suffix]
+        if idx:
+            remainder = suffix[:idx]
+            for edge, child in node._edges.values():
+                if edge.endswith(remainder):
+                    node = child
+                    accu.append(edge[:-idx])
+                    break
+            else:
+                return iter([])
+        return _suffixKeys(node, accu)
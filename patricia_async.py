@@ -0,0 +1,189 @@
+"""
+Asyncio-friendly scanning of text with PATRICIA tries (Py3.7+).
+
+A plain scan over a large string is a tight loop that blocks the event loop
+until it finishes. The coroutines in this module run the same scans, but
+cooperatively yield control to the event loop ``every`` so many offsets
+and/or whenever the time ``budget`` (in seconds) of the current slice is
+spent. Alternatively, strings of at least ``offload`` characters can be
+scanned on an ``executor`` (the loop's default executor if `None`) instead.
+
+Note that scanning is pure Python and CPU-bound: on a thread pool (such as
+the loop's default executor), the scan still holds the GIL and competes with
+the event loop thread, so offloading to threads does not keep the loop's
+latency flat. Use a `TrieExecutor` instead, a process pool that ships the
+trie to each worker once, so only the string is sent with every scan. (Any
+other process pool works as well, but pickles the whole trie for each call.)
+
+Both functions work with `trie` (scanning at each ``start`` offset) and
+`suffixtrie` instances (scanning at each ``end`` offset), and are also
+available as the trie methods ``ascan()`` and ``alongest()``::
+
+    >>> import asyncio
+    >>> from patricia import trie
+    >>> T = trie(foo=1, foobar=2, bar=3)
+    >>> async def scan(text):
+    ...     return [item async for item in T.ascan(text)]
+    >>> asyncio.run(scan('a foobar'))
+    [('foo', 1), ('foobar', 2), ('bar', 3)]
+    >>> asyncio.run(T.alongest('a foobar', every=2))
+    [('foobar', 2)]
+
+License: Apache License v2 (http://www.apache.org/licenses/LICENSE-2.0.html)
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from time import monotonic
+
+from patricia import trie, suffixtrie
+
+__author__ = 'Florian Leitner <florian.leitner@gmail.com>'
+
+
+class _Slicer():
+    # Decide when a scan should yield control back to the event loop.
+
+    def __init__(self, every, budget):
+        self.every = every
+        self.budget = budget
+        self.count = 0
+        self.since = monotonic()
+
+    async def tick(self):
+        self.count += 1
+        if (self.every is not None and self.count >= self.every) or \
+                (self.budget is not None and
+                 monotonic() - self.since >= self.budget):
+            await asyncio.sleep(0)
+            self.count = 0
+            self.since = monotonic()
+
+
+def _scan(T, string, start, end):
+    """
+    Yield the list of (non-empty) key, value pairs found at each offset of
+    the window.
+    """
+    if isinstance(T, suffixtrie):
+        for idx in range(start + 1, end + 1):
+            yield [item for item in T.items(string, start, idx) if item[0]]
+    else:
+        for idx in range(start, end):
+            yield [item for item in T.items(string, idx, end) if item[0]]
+
+
+def _longest(T, string, start, end):
+    """
+    Yield the longest (non-empty) key, value pair at each offset of the window
+    or `None` if there is none, skipping the offsets covered by a match.
+    """
+    if isinstance(T, suffixtrie):
+        idx = end
+        while idx > start:
+            key, value = T.item(string, start, idx, None)
+            if key:
+                idx -= len(key)
+                yield key, value
+            else:
+                idx -= 1
+                yield None
+    else:
+        idx = start
+        while idx < end:
+            key, value = T.item(string, idx, end, None)
+            if key:
+                idx += len(key)
+                yield key, value
+            else:
+                idx += 1
+                yield None
+
+
+_shared = None  # the trie of a TrieExecutor worker process
+
+
+def _install(T):
+    global _shared
+    _shared = T
+
+
+def _collect(fun, *args):
+    "Return the list of all results from ``fun`` (in an executor)."
+    return list(fun(*args))
+
+
+def _collectShared(fun, *args):
+    "Return the list of all results from ``fun`` over the worker's trie."
+    return list(fun(_shared, *args))
+
+
+class TrieExecutor(ProcessPoolExecutor):
+    """
+    A process pool that ships the trie ``T`` to each worker once, when the
+    worker starts, instead of pickling it for every offloaded scan.
+    Note that the workers scan a copy, i.e., later changes to ``T`` are not
+    seen by workers that already started.
+    """
+
+    def __init__(self, T, max_workers=None):
+        ProcessPoolExecutor.__init__(self, max_workers, initializer=_install,
+                                     initargs=(T,))
+        self.trie = T
+
+
+async def _offload(executor, fun, T, *args):
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, TrieExecutor) and executor.trie is T:
+        task = partial(_collectShared, fun, *args)
+    else:
+        task = partial(_collect, fun, T, *args)
+    return await loop.run_in_executor(executor, task)
+
+
+async def ascan(T, string, start=0, end=None, every=1024, budget=None,
+                offload=None, executor=None):
+    """
+    Asynchronously yield all (non-empty) key, value pairs for keys that match
+    ``string`` at any offset (beginning at ``start`` and terminating before
+    ``end``), yielding to the event loop ``every`` so many offsets and/or
+    after each time ``budget``, or run the scan on the ``executor`` if the
+    window is at least ``offload`` characters long.
+    """
+    start, end = trie._window(len(string), start, end)
+    if offload is not None and end - start >= offload:
+        for items in await _offload(executor, _scan, T, string, start, end):
+            for item in items:
+                yield item
+    else:
+        slicer = _Slicer(every, budget)
+        for items in _scan(T, string, start, end):
+            for item in items:
+                yield item
+            await slicer.tick()
+
+
+async def alongest(T, string, start=0, end=None, every=1024, budget=None,
+                   offload=None, executor=None):
+    """
+    Return the list of non-overlapping, longest (non-empty) key, value pairs
+    that match ``string`` (beginning at ``start`` and ending at ``end``) from
+    left to right (or right to left for a `suffixtrie`, but listed in forward
+    order), yielding to the event loop ``every`` so many offsets and/or after
+    each time ``budget``, or run the sweep on the ``executor`` if the window
+    is at least ``offload`` characters long.
+    """
+    start, end = trie._window(len(string), start, end)
+    if offload is not None and end - start >= offload:
+        found = await _offload(executor, _longest, T, string, start, end)
+        found = [item for item in found if item is not None]
+    else:
+        found = []
+        slicer = _Slicer(every, budget)
+        for item in _longest(T, string, start, end):
+            if item is not None:
+                found.append(item)
+            await slicer.tick()
+    if isinstance(T, suffixtrie):
+        found.reverse()
+    return found
@@ -1,3 +1,4 @@
+import sys
 from distutils.core import setup
 import patricia
 
@@ -7,6 +8,11 @@ try:
 except IOError:
     long_description = None
 
+# the asyncio scans use async/await syntax (Py3.7+ only)
+py_modules = ['patricia']
+if sys.version_info >= (3, 7):
+    py_modules.append('patricia_async')
+
 setup(
     name='patricia-trie',
     version=patricia.__version__,
@@ -16,7 +22,7 @@ setup(
     author='Florian Leitner',
     author_email='florian.leitner@gmail.com',
     url='http://www.github.com/fnl/patricia-trie',
-    py_modules=['patricia'],
+    py_modules=py_modules,
     classifiers=[
         'Topic :: Software Development :: Libraries :: Python Modules',
         'Topic :: Scientific/Engineering :: Information Analysis',
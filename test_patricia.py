@@ -5,8 +5,9 @@
 .. moduleauthor:: Florian Leitner <florian.leitner@gmail.com>
 .. License: Apache License v2 (http://www.apache.org/licenses/LICENSE-2.0.html)
 """
+import pickle
 from unittest import main, TestCase
-from patricia import trie, _NonTerminal
+from patricia import trie, suffixtrie, _NonTerminal
 
 __author__ = 'Florian Leitner'
 __version__ = 9
@@ -88,6 +89,11 @@ class TrieTests(TestCase):
         self.assertEqual(('', 0), T.item(''))
         self.assertEqual('', T.key('foo'))
 
+    def testGetLongestTerminal(self):
+        T = trie(a=1, abc=2, abd=3)
+        self.assertEqual(('a', 1), T.item('abx'))
+        self.assertEqual(('abc', 2), T.item('abcd'))
+
     def testGetExactMatch(self):
         T = trie(exact=5)
         self.assertListEqual(['exact'], list(T.keys('exact')))
@@ -99,6 +105,25 @@ class TrieTests(TestCase):
         fake = _NonTerminal()
         self.assertEqual(fake, T.value('foo', default=fake))
 
+    def testPickle(self):
+        T = trie(ba=2, baz=3, fool=1)
+        T = pickle.loads(pickle.dumps(T))
+        self.assertListEqual([('ba', 2), ('baz', 3), ('fool', 1)],
+                             sorted(T.items()))
+        self.assertRaises(KeyError, T.__getitem__, '')
+        self.assertEqual(('ba', 2), T.item('bar'))
+        S = pickle.loads(pickle.dumps(suffixtrie(com=1, om=2)))
+        self.assertEqual(2, len(S))
+        self.assertEqual(('com', 1), S.item('.com'))
+
+    def testPickleDeep(self):
+        T = trie()
+        for i in range(500):
+            T['a' * i + 'b'] = i
+        T = pickle.loads(pickle.dumps(T))
+        self.assertEqual(500, len(T))
+        self.assertEqual(('a' * 400 + 'b', 400), T.item('a' * 400 + 'bc'))
+
     def testLongRootValue(self):
         T = trie(1, 2)
         self.assertEqual((1, 2), T[''])
@@ -174,5 +199,95 @@ class TrieTests(TestCase):
         self.assertEqual(None, T.key('foo', -3, -4, None))
         self.assertEqual(None, T.key('foo', -4, -4, None))
 
+
+class SuffixTrieTests(TestCase):
+    def testInitContains(self):
+        T = suffixtrie(key='value')
+        T = suffixtrie(**T)
+        self.assertTrue('key' in T)
+        self.assertFalse('akey' in T)
+        self.assertFalse('ey' in T)
+        self.assertFalse('kez' in T)
+
+    def testSetGetDel(self):
+        T = suffixtrie()
+        T['com'] = 1
+        T['example.com'] = 2
+        T['sample.com'] = 3
+        T['om'] = 4
+        self.assertEqual(T['com'], 1)
+        self.assertEqual(T['example.com'], 2)
+        self.assertEqual(T['sample.com'], 3)
+        self.assertEqual(T['om'], 4)
+        self.assertRaises(KeyError, T.__getitem__, 'ample.com')
+        self.assertRaises(KeyError, T.__getitem__, 'm')
+        del T['example.com']
+        self.assertRaises(KeyError, T.__getitem__, 'example.com')
+        self.assertEqual(T['sample.com'], 3)
+
+    def testIterRepr(self):
+        T = suffixtrie(ba=2, aba=3, fool=1)
+        self.assertListEqual(sorted(['aba', 'ba', 'fool']), sorted(list(T)))
+        self.assertListEqual([('aba', 3), ('ba', 2), ('fool', 1)],
+                             sorted(T.items()))
+        self.assertEqual(3, len(T))
+        self.assertTrue(repr(T).startswith("suffixtrie({"), repr(T))
+
+    def testGetItems(self):
+        T = suffixtrie(a=1, cba=2, dba=3)
+        self.assertEqual(('cba', 2), T.item('xcba'))
+        self.assertEqual(('a', 1), T.item('xba'))
+        self.assertEqual(3, T.value('dba'))
+        self.assertRaises(KeyError, T.key, 'foo')
+        self.assertEqual(None, T.key('foo', default=None))
+        T[''] = 0
+        self.assertEqual('', T.key('foo'))
+
+    def testOffsetMatching(self):
+        T = suffixtrie(foo=1, baar=2, arhus=3, bazar=4)
+        txt = 'The fool baal baarhus in the bazar!'
+        items = []
+        for i in range(len(txt) + 1):
+            items.extend(T.items(txt, 0, i))
+        self.assertListEqual([('foo', 1), ('baar', 2), ('arhus', 3),
+                              ('bazar', 4)], items)
+
+    def testWindowMatching(self):
+        T = suffixtrie()
+        T['com'] = 1
+        T['example.com'] = 2
+        S = 'www.example.com/'
+        self.assertListEqual(['com', 'example.com'],
+                             list(T.keys(S, 0, -1)))
+        self.assertListEqual([1], list(T.values(S, 10, 15)))
+        self.assertEqual(('example.com', 2), T.item(S, 4, 15))
+        self.assertEqual(('com', 1), T.item(S, 5, 15))
+        self.assertEqual(None, T.key(S, 13, 15, None))
+        self.assertEqual(None, T.key(S, 0, 0, None))
+        self.assertEqual('example.com', T.key(S, -99, -1))
+
+    def testWindowValue(self):
+        T = suffixtrie(com=1, org=2)
+        T['example.com'] = 3
+        S = 'www.example.com and example.org'
+        self.assertEqual(3, T.value(S, 0, 15))
+        self.assertEqual(1, T.value(S, 5, 15))
+        self.assertEqual(2, T.value(S))
+        self.assertEqual(None, T.value(S, 0, 14, None))
+        self.assertRaises(KeyError, T.value, S, 13, 15)
+
+    def testIsSuffixIter(self):
+        T = suffixtrie(b=1, raab=2, suhaab=3)
+        self.assertTrue(T.isSuffix('ab'))
+        self.assertTrue(T.isSuffix('haab'))
+        self.assertTrue(T.isSuffix(''))
+        self.assertFalse(T.isSuffix('xraab'))
+        self.assertTrue(T.isPrefix('su'))
+        self.assertFalse(T.isPrefix('ab'))
+        self.assertListEqual(sorted(['raab', 'suhaab']), sorted(T.iter('ab')))
+        self.assertListEqual(sorted(['raab', 'suhaab']), sorted(T.iter('aab')))
+        self.assertListEqual(sorted(['b', 'raab', 'suhaab']), sorted(T.iter('b')))
+        self.assertListEqual([], list(T.iter('others')))
+
 if __name__ == '__main__':
     main()
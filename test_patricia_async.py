@@ -0,0 +1,124 @@
+"""
+.. py:module:: test_patricia_async
+   :synopsis: Test cases for the asyncio-friendly PATRICIA trie scans.
+
+.. moduleauthor:: Florian Leitner <florian.leitner@gmail.com>
+.. License: Apache License v2 (http://www.apache.org/licenses/LICENSE-2.0.html)
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import main, TestCase
+from patricia import trie, suffixtrie
+from patricia_async import TrieExecutor
+
+__author__ = 'Florian Leitner'
+__version__ = 1
+
+TEXT = 'The fool baal baarhus in the bazar!'
+
+
+async def collect(aiter):
+    return [item async for item in aiter]
+
+
+class AsyncScanTests(TestCase):
+    def setUp(self):
+        self.T = trie(foo=1, baar=2, baarhus=3, bazar=4)
+
+    def testScan(self):
+        items = []
+        for i in range(len(TEXT)):
+            items.extend(self.T.items(TEXT, i))
+        self.assertListEqual(items, asyncio.run(collect(self.T.ascan(TEXT))))
+
+    def testScanWindow(self):
+        self.assertListEqual([('baar', 2)],
+                             asyncio.run(collect(self.T.ascan(TEXT, 9, 18))))
+        self.assertListEqual([], asyncio.run(collect(self.T.ascan(TEXT, 9, -30))))
+
+    def testScanSkipsRoot(self):
+        T = trie('root', foo=1)
+        self.assertListEqual([('foo', 1)],
+                             asyncio.run(collect(T.ascan('xfoo'))))
+        self.assertListEqual([('foo', 1)], asyncio.run(T.alongest('xfoo')))
+        S = suffixtrie('root', com=1)
+        self.assertListEqual([('com', 1)],
+                             asyncio.run(collect(S.ascan('a.com'))))
+
+    def testScanSuffix(self):
+        T = suffixtrie(com=1, example=2, mail=3)
+        self.assertListEqual([('mail', 3), ('example', 2), ('com', 1)],
+                             asyncio.run(collect(T.ascan('mail.example.com'))))
+
+    def testLongest(self):
+        T = trie(foo=1, foobar=2, bar=3)
+        self.assertListEqual([('foobar', 2), ('bar', 3), ('foo', 1)],
+                             asyncio.run(T.alongest('foobar bar food')))
+        self.assertListEqual([('foo', 1)],
+                             asyncio.run(T.alongest('foobar bar food', 0, 5)))
+
+    def testLongestSuffix(self):
+        T = suffixtrie(com=1, example=2, ample=3)
+        self.assertListEqual([('example', 2), ('com', 1)],
+                             asyncio.run(T.alongest('www.example.com')))
+
+    def testTimeSlicing(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        async def scan(**slicing):
+            task = asyncio.ensure_future(ticker())
+            await asyncio.sleep(0)
+            del ticks[:]
+            found = await self.T.alongest(TEXT, **slicing)
+            task.cancel()
+            return found, len(ticks)
+
+        found, count = asyncio.run(scan(every=None))
+        self.assertEqual(0, count)
+        self.assertEqual(found, asyncio.run(scan(every=5))[0])
+        self.assertTrue(asyncio.run(scan(every=5))[1] > 1)
+        self.assertTrue(asyncio.run(scan(every=None, budget=0))[1] > 1)
+
+    def testOffload(self):
+        async def scan(executor):
+            found = await collect(self.T.ascan(TEXT, offload=10,
+                                               executor=executor))
+            longest = await self.T.alongest(TEXT, offload=10,
+                                            executor=executor)
+            return found, longest
+
+        expected = [('foo', 1), ('baar', 2), ('baarhus', 3), ('bazar', 4)]
+        self.assertEqual((expected, [('foo', 1), ('baarhus', 3), ('bazar', 4)]),
+                         asyncio.run(scan(None)))
+        with ThreadPoolExecutor(1) as executor:
+            self.assertEqual(asyncio.run(scan(None)),
+                             asyncio.run(scan(executor)))
+        with ProcessPoolExecutor(1) as executor:
+            self.assertEqual(asyncio.run(scan(None)),
+                             asyncio.run(scan(executor)))
+        with TrieExecutor(self.T, 1) as executor:
+            self.assertEqual(asyncio.run(scan(None)),
+                             asyncio.run(scan(executor)))
+
+    def testOffloadDeep(self):
+        T = suffixtrie()
+        for i in range(500):
+            T['b' + 'a' * i] = i
+        text = 'x' + 'b' + 'a' * 400
+
+        async def scan(executor):
+            return await T.alongest(text, offload=1, executor=executor)
+
+        expected = [('b' + 'a' * 400, 400)]
+        with ProcessPoolExecutor(1) as executor:
+            self.assertEqual(expected, asyncio.run(scan(executor)))
+        with TrieExecutor(T, 1) as executor:
+            self.assertEqual(expected, asyncio.run(scan(executor)))
+
+if __name__ == '__main__':
+    main()